@@ -4,6 +4,9 @@ from contextlib import contextmanager
 from io import StringIO
 import re
 
+# ANSI escape codes used by CrewAI's colored console output
+ANSI_ESCAPE_RE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
 class StreamlitProcessOutput:
     def __init__(self, container):
         self.container = container
@@ -12,8 +15,7 @@ class StreamlitProcessOutput:
         
     def clean_text(self, text):
         # Remove ANSI escape codes
-        ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-        text = ansi_escape.sub('', text)
+        text = ANSI_ESCAPE_RE.sub('', text)
         
         # Clean up the formatting
         text = text.replace('[1m', '').replace('[95m', '').replace('[92m', '').replace('[00m', '')
@@ -0,0 +1,266 @@
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import orjson
+import pandas as pd
+import streamlit as st
+
+from src.lead_generator.crew import LeadOutput
+from src.lead_generator.pipeline import parse_leads, to_lead_output
+
+
+@dataclass
+class RunResults:
+    """Everything computed from a finished run, ready to be rendered"""
+    leads: List[LeadOutput]
+    # The leads as parsed from the crew output, before validation, in the same order
+    raw_leads: List[Dict[str, Any]]
+    scores: List[float]
+    avg_score: float
+    high_quality: int
+    metrics: Optional[Dict[str, Any]]
+    from_cache: bool
+
+
+def build_run_results(raw_output, crew=None, results=None):
+    """Parse, validate and score the leads of a finished run.
+
+    Args:
+        raw_output: Raw text output of the final task
+        crew: The crew or pipeline that ran, None if the result came from cache
+        results: The CrewOutput returned by kickoff
+
+    Returns:
+        RunResults: Leads sorted by score (highest first), with missing
+        scores counted as 0
+    """
+    raw_leads = parse_leads(raw_output)
+    leads = [to_lead_output(lead) for lead in raw_leads]
+
+    # Coerce scores once and reuse them for the summary, sorting and rendering
+    scores = pd.Series([lead.score or 0 for lead in leads], dtype=float).sort_values(ascending=False, kind='stable')
+    sorted_scores = scores.tolist()
+    return RunResults(
+        leads=[leads[i] for i in scores.index],
+        raw_leads=[raw_leads[i] for i in scores.index],
+        scores=sorted_scores,
+        avg_score=float(scores.mean()) if leads else 0.0,
+        # Scores are sorted descending, so the leads scoring 7+ are a prefix
+        high_quality=bisect_right(sorted_scores, -7.0, key=lambda score: -score),
+        metrics=extract_metrics(crew, results),
+        from_cache=crew is None
+    )
+
+
+def extract_metrics(crew, results=None):
+    """Read token usage from a finished crew, falling back to the crew output.
+
+    Args:
+        crew: The crew or pipeline that ran, None if the result came from cache
+        results: The CrewOutput returned by kickoff
+
+    Returns:
+        dict: Token counts plus the raw metrics, or None if none are available
+    """
+    usage = getattr(crew, 'usage_metrics', None) or getattr(results, 'token_usage', None)
+    if usage is None:
+        return None
+
+    # Read the fields straight off the UsageMetrics model
+    metrics_dict = usage.model_dump() if hasattr(usage, "model_dump") else dict(usage)
+    return {
+        'input_tokens': metrics_dict.get('prompt_tokens', 0),
+        'output_tokens': metrics_dict.get('completion_tokens', 0),
+        'total_tokens': metrics_dict.get('total_tokens', 0),
+        # Prompt tokens served from the provider's prompt cache
+        'cached_tokens': metrics_dict.get('cached_prompt_tokens', 0),
+        'raw': metrics_dict
+    }
+
+
+@st.cache_data
+def build_report(results_json: str) -> str:
+    """Build the downloadable markdown report, once per result set.
+
+    Args:
+        results_json: The parsed leads as a JSON array, in the order they should appear
+
+    Returns:
+        str: The report, ending with the raw JSON data
+    """
+    results_list = orjson.loads(results_json)
+    leads = [to_lead_output(lead) for lead in results_list]
+
+    parts = ["# Lead Generation Report\n\n"]
+    for lead in leads:
+        parts.append(f"## {lead.company_name or 'N/A'}\n\n")
+        parts.append(f"- **Annual Revenue:** {lead.annual_revenue or 'N/A'}\n")
+        parts.append(f"- **Website:** {lead.website_url or 'N/A'}\n")
+        parts.append(f"- **Review:** {lead.review or 'N/A'}\n")
+        parts.append(f"- **Number of Employees:** {lead.num_employees or 'N/A'}\n")
+        parts.append(f"- **Score:** {lead.score if lead.score is not None else 'N/A'}/10\n\n")
+
+        # Add key decision makers
+        kdm = lead.key_decision_makers or []
+        if kdm:
+            parts.append("### Key Decision Makers\n")
+            for person in kdm:
+                parts.append(f"- {person.get('name') or 'N/A'} ({person.get('role') or 'N/A'}): {person.get('linkedin') or 'N/A'}\n")
+            parts.append("\n")
+
+        parts.append("---\n\n")
+
+    # Also include raw JSON data at the end
+    parts.append(f"\n## Raw JSON Data\n\n```json\n{orjson.dumps(results_list, option=orjson.OPT_INDENT_2).decode()}\n```\n")
+    return "".join(parts)
+
+
+def render_lead(idx, lead, score):
+    """Render a single lead inside an expander"""
+    with st.expander(f"🏢 {idx}. {lead.company_name or 'Unknown Company'} (Score: {lead.score if lead.score is not None else 'N/A'}/10)", expanded=False):
+        # Company header with score-based color
+        if score >= 8:
+            header_color = "green"
+        elif score >= 6:
+            header_color = "orange"
+        else:
+            header_color = "gray"
+
+        st.markdown(f"<h3 style='color: {header_color};'>{lead.company_name or 'N/A'}</h3>", unsafe_allow_html=True)
+
+        col1, col2 = st.columns([3, 2])
+
+        with col1:
+            st.markdown("#### Company Information")
+            st.markdown(f"**Annual Revenue:** {lead.annual_revenue or 'N/A'}")
+
+            location = lead.location
+            if isinstance(location, dict):
+                st.markdown(f"**Location:** {location.get('city') or 'N/A'}, {location.get('country') or 'N/A'}")
+            else:
+                st.markdown(f"**Location:** {location or 'N/A'}")
+
+            website = lead.website_url or 'N/A'
+            st.markdown(f"**Website:** [{website}]({website})" if website != 'N/A' else "**Website:** N/A")
+            st.markdown(f"**Number of Employees:** {lead.num_employees or 'N/A'}")
+
+        with col2:
+            st.markdown("#### Company Profile")
+            st.markdown(f"**Match Score:** {lead.score if lead.score is not None else 'N/A'}/10")
+            st.progress(score / 10)
+
+        st.markdown("#### Business Overview")
+        st.markdown(lead.review or 'N/A')
+
+        if lead.recommendations:
+            st.markdown("#### Recommendations")
+            st.markdown(lead.recommendations)
+
+        # Display key decision makers in markdown format
+        kdm = lead.key_decision_makers or []
+        if kdm:
+            st.markdown("#### Key Decision Makers")
+            for person in kdm:
+                name = person.get('name') or 'N/A'
+                role = person.get('role') or 'N/A'
+                linkedin = person.get('linkedin') or '#'
+
+                linkedin_link = f"[LinkedIn Profile]({linkedin})" if linkedin != '#' else 'N/A'
+                st.markdown(f"**{name}** - {role} ({linkedin_link})")
+
+
+@st.fragment
+def render_download(raw_leads, file_name):
+    """Render the download section, so clicking it doesn't rerun the whole page"""
+    st.markdown("### 📥 Download Research Report")
+    results_json = orjson.dumps(raw_leads).decode()
+    st.download_button(
+        label="Download Full Report",
+        # Only build the report when it is actually downloaded
+        data=lambda: build_report(results_json),
+        file_name=file_name,
+        mime="text/plain"
+    )
+
+
+def render_usage_metrics(run, usage_summary, cache_stats):
+    """Render token usage for this run and the running totals"""
+    st.markdown("### 💰 Usage Metrics")
+
+    # Cached results didn't call the LLM at all
+    if run.from_cache:
+        st.info("♻️ Served from cache - no tokens used for this run")
+    elif run.metrics:
+        metrics = run.metrics
+
+        # Display the metrics
+        with st.expander("🔍 Raw Metrics", expanded=False):
+            st.json(metrics['raw'])
+
+        # Calculate approximate cost based on gpt-4 rates
+        # $0.03/1K input tokens, $0.06/1K output tokens
+        input_cost = (metrics['input_tokens'] / 1000000) * 0.015
+        output_cost = (metrics['output_tokens'] / 1000000) * 0.06
+        total_cost = input_cost + output_cost
+
+        # Display metrics in a user-friendly way
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Total Cost", f"${total_cost:.4f}")
+        with col2:
+            st.metric("Input Tokens", f"{metrics['input_tokens']:,}")
+        with col3:
+            st.metric("Cached Tokens", f"{metrics['cached_tokens']:,}")
+        with col4:
+            st.metric("Output Tokens", f"{metrics['output_tokens']:,}")
+    else:
+        st.info("No usage metrics available for this run")
+
+    if usage_summary:
+        st.caption(f"All runs so far: {usage_summary['total_tokens']:,} tokens, ${usage_summary['total_cost']:.4f}")
+
+    # Show how often the result cache saved a run
+    with st.expander("🗄️ Cache Stats", expanded=False):
+        st.json(cache_stats)
+
+
+def render_results(run, usage_summary, cache_stats, file_name):
+    """Render the leads, the download section and the usage metrics.
+
+    Args:
+        run: RunResults for the finished run
+        usage_summary: Totals from the pricing tracker, None if tracking failed
+        cache_stats: Hit/miss counters from the result cache
+        file_name: File name for the downloadable report
+    """
+    st.success("✅ Lead generation process completed successfully!")
+
+    st.markdown("### Your Leads are ready!")
+
+    if not run.leads:
+        st.warning("No leads were found in the results")
+        return
+
+    # Display metrics summary
+    metrics_col1, metrics_col2, metrics_col3 = st.columns(3)
+    with metrics_col1:
+        st.metric("Total Leads", f"{len(run.leads)}")
+    with metrics_col2:
+        st.metric("Average Score", f"{run.avg_score:.1f}/10")
+    with metrics_col3:
+        st.metric("High-Quality Leads", f"{run.high_quality}")
+
+    # Display each lead in a structured format
+    for idx, (lead, score) in enumerate(zip(run.leads, run.scores), 1):
+        render_lead(idx, lead, score)
+
+    # Add a JSON view option at the bottom
+    with st.expander("🔍 View Raw Data", expanded=False):
+        st.json(run.raw_leads)
+
+    # Download section
+    render_download(run.raw_leads, file_name)
+
+    # Usage metrics section - immediately after results and download
+    render_usage_metrics(run, usage_summary, cache_stats)
@@ -1,27 +1,41 @@
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from dotenv import load_dotenv
+from functools import lru_cache
 from pydantic import BaseModel, Field
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
 
 from crewai_tools import SerperDevTool, ScrapeWebsiteTool
 
+from .tools.batch_scrape import BatchScrapeWebsiteTool
+
 load_dotenv()
 
-# Tools
-search_tool = SerperDevTool()
-scrape_tool = ScrapeWebsiteTool()
+# Tools, created on first use rather than at import time and shared by the
+# agents. They hold no results: LeadPipeline caches tool calls per run.
+@lru_cache(maxsize=None)
+def search_tool() -> SerperDevTool:
+	return SerperDevTool()
+
+@lru_cache(maxsize=None)
+def scrape_tool() -> ScrapeWebsiteTool:
+	return ScrapeWebsiteTool()
+
+@lru_cache(maxsize=None)
+def batch_scrape_tool() -> BatchScrapeWebsiteTool:
+	return BatchScrapeWebsiteTool()
 
 # Define your schema
 class LeadOutput(BaseModel):
-    company_name: Optional[str] = Field(description="The name of the company")
-    annual_revenue: Optional[str] = Field(description="Annual revenue of the company")
-    location: Optional[Dict[str, str]] = Field(description="Location with city and country fields")
-    website_url: Optional[str] = Field(description="Company website URL")
-    review: Optional[str] = Field(description="Description of what the company does")
-    num_employees: Optional[int] = Field(description="Number of employees")
-    key_decision_makers: Optional[List[Dict[str, str]]] = Field(description="List of key people with their LinkedIn profiles")
-    score: Optional[int] = Field(description="Fit score on a scale of 1-10")
+    company_name: Optional[str] = Field(default=None, description="The name of the company")
+    annual_revenue: Optional[str] = Field(default=None, description="Annual revenue of the company")
+    location: Optional[Union[str, Dict[str, Optional[str]]]] = Field(default=None, description="Location with city and country fields")
+    website_url: Optional[str] = Field(default=None, description="Company website URL")
+    review: Optional[str] = Field(default=None, description="Description of what the company does")
+    num_employees: Optional[int] = Field(default=None, description="Number of employees")
+    key_decision_makers: Optional[List[Dict[str, Optional[str]]]] = Field(default=None, description="List of key people with their LinkedIn profiles")
+    score: Optional[Union[int, float]] = Field(default=None, description="Fit score on a scale of 1-10")
+    recommendations: Optional[str] = Field(default=None, description="Sales recommendations for approaching the company")
 
 # Crew
 @CrewBase
@@ -35,7 +49,7 @@ class LeadGenerator():
 	def lead_generator(self) -> Agent:
 		return Agent(
 			config=self.agents_config['lead_generator'],
-			tools=[search_tool, scrape_tool],
+			tools=[search_tool(), scrape_tool(), batch_scrape_tool()],
 			verbose=True
 		)
 	
@@ -43,7 +57,7 @@ class LeadGenerator():
 	def contact_agent(self) -> Agent:
 		return Agent(
 			config=self.agents_config['contact_agent'],
-			tools=[search_tool, scrape_tool],
+			tools=[search_tool(), scrape_tool(), batch_scrape_tool()],
 			verbose=True
 		)
 
@@ -66,7 +80,7 @@ class LeadGenerator():
 	def lead_generation_task(self) -> Task:
 		return Task(
 			config=self.tasks_config['lead_generation_task'],
-			output_pydantic=LeadOutput
+			# The expected output is a JSON array, which LeadOutput can't hold
 		)
 
 	@task
@@ -93,6 +107,55 @@ class LeadGenerator():
 			output_pydantic=LeadOutput
 		)
 
+	# Per-lead tasks used by the parallel pipeline. These are deliberately not
+	# decorated with @task so they stay out of the sequential crew below.
+	def lead_contact_research_task(self) -> Task:
+		return Task(
+			config=self.tasks_config['lead_contact_research_task'],
+		)
+
+	def lead_scoring_task(self, contact_research: Task) -> Task:
+		return Task(
+			config=self.tasks_config['lead_scoring_task'],
+			context=[contact_research],
+			output_pydantic=LeadOutput,
+		)
+
+	def lead_prioritization_task(self) -> Task:
+		return Task(
+			config=self.tasks_config['lead_prioritization_task'],
+		)
+
+	def lead_generation_crew(self) -> Crew:
+		"""Creates the crew that finds the initial list of leads"""
+		return Crew(
+			agents=[self.lead_generator()],
+			tasks=[self.lead_generation_task()],
+			process=Process.sequential,
+			verbose=True,
+		)
+
+	def lead_research_crew(self) -> Crew:
+		"""Creates the crew that researches and qualifies a single lead"""
+		# These tasks aren't memoized, so the scoring task must be given the
+		# very research task that runs as its context
+		contact_research = self.lead_contact_research_task()
+		return Crew(
+			agents=[self.contact_agent(), self.lead_qualifier()],
+			tasks=[contact_research, self.lead_scoring_task(contact_research)],
+			process=Process.sequential,
+			verbose=True,
+		)
+
+	def sales_management_crew(self) -> Crew:
+		"""Creates the crew that prioritizes the qualified leads"""
+		return Crew(
+			agents=[self.sales_manager()],
+			tasks=[self.lead_prioritization_task()],
+			process=Process.sequential,
+			verbose=True,
+		)
+
 	@crew
 	def crew(self) -> Crew:
 		"""Creates the LeadGenerator crew"""
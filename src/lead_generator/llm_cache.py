@@ -0,0 +1,134 @@
+import hashlib
+import json
+import logging
+import math
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import diskcache
+from openai import OpenAI
+
+DEFAULT_TTL = 24 * 60 * 60  # 24 hours
+SIMILARITY_THRESHOLD = 0.92
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+logger = logging.getLogger(__name__)
+
+
+def cosine_similarity(a: List[float], b: List[float]) -> float:
+    """Cosine similarity between two vectors"""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class LLMCache:
+    """Caches crew results per (industry, country) to avoid repeating LLM calls.
+
+    Exact matches are looked up by a hash of the normalized inputs. When there is
+    no exact match, the industry is embedded and compared against cached entries
+    for the same country, so near-duplicates like "AI LLMs" and "AI-powered SaaS"
+    can share a result. Embeddings are kept apart from the results, so the
+    similarity scan never loads the results themselves.
+    """
+
+    def __init__(self, directory: Path = Path(".cache/llm"), ttl: int = DEFAULT_TTL,
+                 similarity_threshold: float = SIMILARITY_THRESHOLD):
+        """Initialize the cache"""
+        self.results = diskcache.Cache(str(directory / "results"))
+        self.embeddings = diskcache.Cache(str(directory / "embeddings"))
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self._client: Optional[OpenAI] = None
+        self._client_key: Optional[str] = None
+
+    @staticmethod
+    def cache_key(industry: str, country: str) -> str:
+        """Build the exact-match key for a pair of inputs"""
+        payload = json.dumps({
+            "industry": industry.lower().strip(),
+            "country": country.lower().strip()
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def lookup(self, industry: str, country: str) -> Tuple[Optional[str], Optional[List[float]]]:
+        """Look up the cached result for these inputs.
+
+        Args:
+            industry: Industry the search was for
+            country: Country the search was for
+
+        Returns:
+            tuple: The result, None on a miss, and the industry's embedding if
+            one was computed, to be passed back to ``set`` on a miss
+        """
+        result = self.results.get(self.cache_key(industry, country))
+        if result is not None:
+            self.hits += 1
+            return result, None
+
+        # Nothing to compare against, don't pay for an embedding yet
+        embedding = self._embed(industry) if len(self.embeddings) else None
+        key = self._find_similar(embedding, country) if embedding is not None else None
+        result = self.results.get(key) if key is not None else None
+        if result is not None:
+            self.semantic_hits += 1
+            return result, embedding
+
+        self.misses += 1
+        return None, embedding
+
+    def set(self, industry: str, country: str, result: str, embedding: Optional[List[float]] = None) -> None:
+        """Store a result for these inputs, embedding the industry unless given its embedding"""
+        key = self.cache_key(industry, country)
+        self.results.set(key, result, expire=self.ttl)
+
+        if embedding is None:
+            embedding = self._embed(industry)
+        if embedding is not None:
+            self.embeddings.set(key, {
+                "country": country.lower().strip(),
+                "embedding": embedding
+            }, expire=self.ttl)
+
+    @property
+    def stats(self):
+        """Return hit/miss counters"""
+        return {
+            'hits': self.hits,
+            'semantic_hits': self.semantic_hits,
+            'misses': self.misses,
+            'entries': len(self.results)
+        }
+
+    def _find_similar(self, embedding: List[float], country: str) -> Optional[str]:
+        """Find the key of the most similar cached entry for the same country"""
+        best_key, best_score = None, self.similarity_threshold
+        country = country.lower().strip()
+        for key in self.embeddings.iterkeys():
+            entry = self.embeddings.get(key)
+            if not entry or entry["country"] != country:
+                continue
+            score = cosine_similarity(embedding, entry["embedding"])
+            if score > best_score:
+                best_key, best_score = key, score
+        return best_key
+
+    def _embed(self, text: str) -> Optional[List[float]]:
+        """Embed text for similarity lookups, None if embeddings are unavailable"""
+        try:
+            # The cache outlives sessions, so rebuild the client whenever the
+            # API key changes rather than billing every session to the first key
+            api_key = os.environ.get("OPENAI_API_KEY")
+            if self._client is None or api_key != self._client_key:
+                self._client = OpenAI(api_key=api_key)
+                self._client_key = api_key
+            response = self._client.embeddings.create(model=EMBEDDING_MODEL, input=text.lower().strip())
+        except Exception as e:
+            logger.warning("Embedding failed, skipping similarity lookup: %s", e)
+            return None
+        return response.data[0].embedding
@@ -0,0 +1,156 @@
+import asyncio
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+import orjson
+from crewai.crews.crew_output import CrewOutput
+from crewai.types.usage_metrics import UsageMetrics
+from pydantic import ValidationError
+
+from .crew import LeadGenerator, LeadOutput
+from .tools.cached_tool import CachedTool
+
+# Upper bound on leads researched at once, keeps Serper/scrape traffic polite
+MAX_CONCURRENCY = 5
+
+# LLMs often wrap their JSON in a markdown code block
+CODE_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+
+def _extract_json_array(raw: str) -> Any:
+    """Decode the first JSON array in raw, ignoring code fences and surrounding text"""
+    fenced = CODE_FENCE_RE.search(raw)
+    text = fenced.group(1) if fenced else raw
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        pass
+
+    decoder = json.JSONDecoder()
+    start = text.find('[')
+    while start != -1:
+        try:
+            value, _ = decoder.raw_decode(text, start)
+        except ValueError:
+            value = None
+        if isinstance(value, list):
+            return value
+        start = text.find('[', start + 1)
+    return None
+
+
+def parse_leads(raw: str) -> List[Dict[str, Any]]:
+    """Parse the JSON array of leads produced by the lead generation task.
+
+    Args:
+        raw: Raw text output of the task, possibly wrapped in a code fence
+            or surrounded by prose
+
+    Returns:
+        list: The leads found, empty if the output holds no JSON array
+    """
+    if not isinstance(raw, str):
+        return []
+    leads = _extract_json_array(raw)
+    return [lead for lead in leads if isinstance(lead, dict)] if isinstance(leads, list) else []
+
+
+def to_lead_output(lead: Dict[str, Any]) -> LeadOutput:
+    """Validate a parsed lead, dropping any fields that don't fit the schema.
+
+    Args:
+        lead: A lead as returned by parse_leads
+
+    Returns:
+        LeadOutput: The validated lead
+    """
+    try:
+        return LeadOutput.model_validate(lead)
+    except ValidationError as e:
+        invalid = {error['loc'][0] for error in e.errors() if error['loc']}
+        return LeadOutput.model_validate({k: v for k, v in lead.items() if k not in invalid})
+
+
+class LeadPipeline:
+    """Runs the LeadGenerator agents with research fanned out per lead.
+
+    Lead generation runs first, then contact research and qualification run
+    concurrently for every lead found, and the sales manager prioritizes the
+    gathered results. Exposes ``kickoff`` and ``usage_metrics`` like a Crew.
+
+    Crews are copied before each run, so one LeadGenerator can be shared
+    between pipelines. Each run caches tool results in a dict of its own, so
+    concurrent runs never share or clear each other's results.
+    ``task_callback`` is called with every TaskOutput as soon as its task
+    finishes, from the thread running that crew.
+    """
+
+    def __init__(self, lead_generator: Optional[LeadGenerator] = None, max_concurrency: int = MAX_CONCURRENCY,
+                 task_callback: Optional[Callable[[Any], None]] = None):
+        """Initialize the pipeline"""
+        self.lead_generator = lead_generator or LeadGenerator()
+        self.max_concurrency = max_concurrency
+        self.task_callback = task_callback
+        self.usage_metrics = UsageMetrics()
+
+    def kickoff(self, inputs: Dict[str, Any]) -> CrewOutput:
+        """Run the pipeline and return the sales manager's output"""
+        return asyncio.run(self.kickoff_async(inputs=inputs))
+
+    async def kickoff_async(self, inputs: Dict[str, Any]) -> CrewOutput:
+        """Asynchronously run the pipeline and return the sales manager's output"""
+        self.usage_metrics = UsageMetrics()
+        # Searches and scrapes repeat across this run's crews, but not across runs
+        tool_cache: Dict[str, Any] = {}
+
+        generation_crew = self._prepare(self.lead_generator.lead_generation_crew(), tool_cache)
+        generation = await generation_crew.kickoff_async(inputs=inputs)
+        self._add_usage(generation_crew)
+
+        leads = parse_leads(generation.raw)
+        if not leads:
+            # Nothing to research, don't pay for the sales crew either
+            raise ValueError("Lead generation did not return any leads to research")
+        qualified_leads = await self._research_leads(leads, inputs, tool_cache)
+
+        sales_crew = self._prepare(self.lead_generator.sales_management_crew(), tool_cache)
+        results = await sales_crew.kickoff_async(inputs={
+            **inputs,
+            "qualified_leads": json.dumps(qualified_leads, indent=2)
+        })
+        self._add_usage(sales_crew)
+        return results
+
+    async def _research_leads(self, leads: List[Dict[str, Any]], inputs: Dict[str, Any],
+                              tool_cache: Dict[str, Any]) -> List[Any]:
+        """Research and qualify every lead concurrently, bounded by max_concurrency"""
+        research_crew = self.lead_generator.lead_research_crew()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def research(lead):
+            async with semaphore:
+                # Each lead gets its own copy so agents don't share execution state
+                crew = self._prepare(research_crew, tool_cache)
+                output = await crew.kickoff_async(inputs={**inputs, "lead": json.dumps(lead)})
+                self._add_usage(crew)
+                return output
+
+        outputs = await asyncio.gather(*(research(lead) for lead in leads))
+        return [output.pydantic.model_dump() if output.pydantic else output.raw for output in outputs]
+
+    def _prepare(self, crew, tool_cache: Dict[str, Any]):
+        """Copy a crew for a single run, attaching the task callback and the run's tool cache"""
+        crew = crew.copy()
+        # Tasks keep their own copy of the agent's tools, so wrap both
+        for member in (*crew.agents, *crew.tasks):
+            if member.tools:
+                member.tools = [CachedTool(tool, cache=tool_cache) for tool in member.tools]
+        if self.task_callback:
+            crew.task_callback = self.task_callback
+        return crew
+
+    def _add_usage(self, crew) -> None:
+        """Accumulate a finished crew's token usage"""
+        if crew.usage_metrics:
+            self.usage_metrics.add_usage_metrics(crew.usage_metrics)
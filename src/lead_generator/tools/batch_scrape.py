@@ -0,0 +1,64 @@
+import asyncio
+import re
+from typing import List, Type
+
+import httpx
+from bs4 import BeautifulSoup
+from crewai_tools import ScrapeWebsiteTool
+from pydantic import BaseModel, Field
+
+MAX_CONCURRENCY = 5
+
+
+class BatchScrapeWebsiteToolSchema(BaseModel):
+    """Input for BatchScrapeWebsiteTool."""
+
+    urls: List[str] = Field(..., description="Mandatory list of website urls to read")
+
+
+class BatchScrapeWebsiteTool(ScrapeWebsiteTool):
+    """Reads several websites concurrently, reusing ScrapeWebsiteTool's headers and parsing"""
+
+    name: str = "Read multiple websites content"
+    description: str = (
+        "A tool that reads the content of several websites at once. "
+        "Prefer it over reading websites one by one when more than one url is known."
+    )
+    args_schema: Type[BaseModel] = BatchScrapeWebsiteToolSchema
+    max_concurrency: int = MAX_CONCURRENCY
+
+    def _run(self, urls: List[str]) -> str:
+        return asyncio.run(self._arun(urls))
+
+    async def _arun(self, urls: List[str]) -> str:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with httpx.AsyncClient(headers=self.headers, cookies=self.cookies, timeout=15, follow_redirects=True) as client:
+            async def scrape(url):
+                async with semaphore:
+                    try:
+                        page = await client.get(url)
+                        text = self._html_to_text(page.text)
+                    except httpx.TimeoutException:
+                        # A slow site would only time out again through requests
+                        text = "Could not read website: timed out"
+                    except Exception:
+                        # Fall back to the single-page tool's own request handling,
+                        # e.g. for urls httpx rejects as invalid
+                        try:
+                            text = await asyncio.to_thread(ScrapeWebsiteTool._run, self, website_url=url)
+                        except Exception as e:
+                            text = f"Could not read website: {e}"
+                    return f"URL: {url}\n{text}"
+
+            pages = await asyncio.gather(*(scrape(url) for url in urls))
+
+        return "\n\n---\n\n".join(pages)
+
+    @staticmethod
+    def _html_to_text(html: str) -> str:
+        """Same text cleanup as ScrapeWebsiteTool"""
+        text = BeautifulSoup(html, "html.parser").get_text(" ")
+        text = re.sub("[ \t]+", " ", text)
+        text = re.sub("\\s+\n\\s+", "\n", text)
+        return text
@@ -0,0 +1,37 @@
+import hashlib
+from typing import Any, Dict, Optional
+
+from crewai.tools import BaseTool
+from pydantic import PrivateAttr
+
+
+class CachedTool(BaseTool):
+    """Wraps a tool and reuses its result when called again with the same arguments.
+
+    Results are stored in ``cache``, keyed by tool name and arguments, so every
+    tool of a pipeline run can share the one dict owned by that run.
+    """
+
+    tool: BaseTool
+    _cache: Dict[str, Any] = PrivateAttr(default_factory=dict)
+
+    def __init__(self, tool: BaseTool, cache: Optional[Dict[str, Any]] = None, **kwargs):
+        super().__init__(
+            tool=tool,
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            **kwargs
+        )
+        if cache is not None:
+            self._cache = cache
+
+    def _generate_description(self):
+        # The wrapped tool's description is already formatted
+        pass
+
+    def _run(self, **kwargs: Any) -> Any:
+        key = hashlib.sha256(repr((self.name, sorted(kwargs.items()))).encode()).hexdigest()
+        if key not in self._cache:
+            self._cache[key] = self.tool._run(**kwargs)
+        return self._cache[key]
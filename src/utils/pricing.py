@@ -1,6 +1,26 @@
 from dataclasses import dataclass, field
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime
+from pathlib import Path
+import json
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+
+def atomic_write_json(path: Path, data: Dict[str, Any]):
+    """Write JSON to path without ever leaving a partially written file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
 
 @dataclass
 class ModelUsage:
@@ -16,14 +36,37 @@ class ModelUsage:
         return round(input_cost + output_cost, 6)
 
 class ModelsPricing:
-    """Manages pricing and cost calculations for GPT-4o-mini"""
+    """Manages pricing and cost calculations for GPT-4o-mini
+    
+    When a path is given, totals are loaded from it on start and saved to it
+    after every tracked usage, so they survive restarts.
+    """
     
-    def __init__(self):
+    def __init__(self, path: Optional[Path] = None):
         """Initialize pricing tracker"""
+        self.path = path
         self.total_tokens = 0
         self.input_tokens = 0
         self.output_tokens = 0
         self.total_cost = 0.0
+        
+        if path is not None and path.exists():
+            self._load(path)
+    
+    def _load(self, path: Path):
+        """Load saved totals, starting from zero if the file is unreadable"""
+        try:
+            state = json.loads(path.read_text())
+            totals = (
+                int(state.get('total_tokens', 0)),
+                int(state.get('input_tokens', 0)),
+                int(state.get('output_tokens', 0)),
+                float(state.get('total_cost', 0.0))
+            )
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.warning("Ignoring unreadable pricing state at %s: %s", path, e)
+            return
+        self.total_tokens, self.input_tokens, self.output_tokens, self.total_cost = totals
     
     def track_usage(self, input_tokens=0, output_tokens=0):
         """Track usage metrics"""
@@ -35,6 +78,12 @@ class ModelsPricing:
         input_cost = (input_tokens / 1000) * 0.03  # $0.03 per 1K tokens
         output_cost = (output_tokens / 1000) * 0.06  # $0.06 per 1K tokens
         self.total_cost += (input_cost + output_cost)
+        
+        if self.path is not None:
+            try:
+                atomic_write_json(self.path, self.get_usage_summary())
+            except OSError as e:
+                logger.warning("Could not save pricing state to %s: %s", self.path, e)
     
     def get_usage_summary(self):
         """Return summary of usage"""
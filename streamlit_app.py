@@ -3,20 +3,58 @@ import pysqlite3
 sys.modules["sqlite3"] = pysqlite3
 
 import streamlit as st
+import asyncio
 import os
-import sys
-from datetime import datetime
+import queue
 from pathlib import Path
-import json
-import pandas as pd
-import re
 
 from src.components.sidebar import render_sidebar
-from src.components.output_handler import capture_output
-from src.lead_generator.crew import LeadGenerator
-from src.utils.pricing import ModelsPricing
+
+# CrewAI, pandas and the pipeline modules are slow to import, so they are
+# only imported once a run is actually requested
+
+
+@st.cache_resource
+def get_lead_generator():
+    """Load the agent and task configuration once per server process"""
+    from src.lead_generator.crew import LeadGenerator
+    return LeadGenerator()
+
+
+@st.cache_resource
+def get_pricing_tracker():
+    """Load the pricing tracker, persisted across restarts, once per server process"""
+    from src.utils.pricing import ModelsPricing
+    return ModelsPricing(path=Path("~/.lead_generator/pricing.json").expanduser())
+
+
+@st.cache_resource
+def get_llm_cache():
+    """Open the result cache once per server process"""
+    from src.lead_generator.llm_cache import LLMCache
+    return LLMCache()
 
 
+async def run_with_progress(pipeline, inputs, progress, placeholder):
+    """Run the pipeline, listing each task in the placeholder as it finishes.
+
+    Task callbacks fire on the crews' worker threads, which can't touch
+    Streamlit elements, so they only push outputs onto the progress queue
+    and this coroutine renders them from the script thread.
+    """
+    run = asyncio.create_task(pipeline.kickoff_async(inputs=inputs))
+    lines = []
+    while True:
+        finished, _ = await asyncio.wait({run}, timeout=0.5)
+        while not progress.empty():
+            output = progress.get_nowait()
+            company = getattr(output.pydantic, 'company_name', None)
+            lines.append(f"✅ **{output.agent.strip()}** finished" + (f": {company}" if company else ""))
+        if lines:
+            placeholder.markdown("\n\n".join(lines))
+        if finished:
+            return run.result()
+
 
 # Set page configuration
 st.set_page_config(
@@ -109,8 +147,6 @@ results_container = st.container()
 # Initialize session state for persistent storage
 if 'results' not in st.session_state:
     st.session_state.results = None
-if 'pricing_tracker' not in st.session_state:
-    st.session_state.pricing_tracker = ModelsPricing()
 
 # Update the run button section to preserve state
 if run_button:
@@ -119,272 +155,77 @@ if run_button:
     elif not os.environ.get("OPENAI_API_KEY"):
         st.warning("⚠️ Please enter your OpenAI API key in the sidebar to continue")
     else:
+        from src.components.results_view import build_run_results, render_results
+        from src.lead_generator.pipeline import LeadPipeline, parse_leads
+
+        # Phase 1: run the crew (or reuse a cached result) and compute everything to show
+        run = None
         with st.status("🤖 Researching... This may take several minutes.", expanded=True) as status:
             try:
-                # Initialize the crew
-                lead_gen_crew = LeadGenerator().crew()
-                
-                # Run the crew with industry and country inputs
-                results = lead_gen_crew.kickoff(inputs={
-                    "industry": industry,
-                    "country": country
-                })
-                
-                # Store results in session state immediately
-                st.session_state.results = results
-                status.update(label="✅ Lead generation completed!", state="complete", expanded=False)
-                
-                # Now let's process the results first
-                with results_container:
-                    st.success("✅ Lead generation process completed successfully!")
+                # Reuse a previous result for the same (or a very similar) search
+                raw_output, embedding = get_llm_cache().lookup(industry, country)
+                lead_gen_crew = None
+                results = None
+
+                if raw_output is None:
+                    # Initialize the pipeline (researches each lead in parallel)
+                    progress = queue.Queue()
+                    lead_gen_crew = LeadPipeline(get_lead_generator(), task_callback=progress.put)
                     
-                    st.markdown("### Your Leads are ready!")
+                    # Run the crew with industry and country inputs, showing progress as tasks finish
+                    results = asyncio.run(run_with_progress(lead_gen_crew, {
+                        "industry": industry,
+                        "country": country
+                    }, progress, st.empty()))
                     
-                    try:
-                        # Get the results from the CrewOutput object
-                        results = st.session_state.results
-                        
-                        # Try to get the last task's output
-                        if hasattr(results, 'tasks_output') and results.tasks_output:
-                            last_task = results.tasks_output[-1]
-                            if hasattr(last_task, 'raw'):
-                                results_list = json.loads(last_task.raw)
-                            else:
-                                # Fallback to raw attribute if it exists
-                                results_list = json.loads(results.raw) if hasattr(results, 'raw') else []
-                        else:
-                            # If no tasks_output, try raw directly
-                            results_list = json.loads(results.raw) if hasattr(results, 'raw') else []
-
-                        if not results_list:
-                            st.warning("No leads were found in the results")
-                            st.stop()
-
-                        # Create metrics summary
-                        total_leads = len(results_list)
-                        avg_score = sum(float(lead.get('score', 0)) for lead in results_list if isinstance(lead, dict)) / total_leads if total_leads > 0 else 0
-                        
-                        # Display metrics summary
-                        metrics_col1, metrics_col2, metrics_col3 = st.columns(3)
-                        with metrics_col1:
-                            st.metric("Total Leads", f"{total_leads}")
-                        with metrics_col2:
-                            st.metric("Average Score", f"{avg_score:.1f}/10")
-                        with metrics_col3:
-                            st.metric("High-Quality Leads", f"{sum(1 for lead in results_list if isinstance(lead, dict) and float(lead.get('score', 0)) >= 7)}")
-
-                        # Sort leads by score (highest first)
-                        results_list = sorted(
-                            results_list,
-                            key=lambda x: float(x.get('score', 0)) if isinstance(x, dict) else 0,
-                            reverse=True
-                        )
-
-                        # Display each lead in a structured format
-                        for idx, lead in enumerate(results_list, 1):
-                            if not isinstance(lead, dict):
-                                continue
-                            
-                            # Create an expander for each company
-                            with st.expander(f"🏢 {idx}. {lead.get('company_name', 'Unknown Company')} (Score: {lead.get('score', 'N/A')}/10)", expanded=False):
-                                # Company header with score-based color
-                                score = float(lead.get('score', 0))
-                                if score >= 8:
-                                    header_color = "green"
-                                elif score >= 6:
-                                    header_color = "orange"
-                                else:
-                                    header_color = "gray"
-                                
-                                st.markdown(f"<h3 style='color: {header_color};'>{lead.get('company_name', 'N/A')}</h3>", unsafe_allow_html=True)
-                                
-                                col1, col2 = st.columns([3, 2])
-                                
-                                with col1:
-                                    st.markdown("#### Company Information")
-                                    st.markdown(f"**Annual Revenue:** {lead.get('annual_revenue', 'N/A')}")
-                                    
-                                    location = lead.get('location', {})
-                                    if isinstance(location, dict):
-                                        st.markdown(f"**Location:** {location.get('city', 'N/A')}, {location.get('country', 'N/A')}")
-                                    else:
-                                        st.markdown(f"**Location:** {location or 'N/A'}")
-                                    
-                                    website = lead.get('website_url', 'N/A')
-                                    st.markdown(f"**Website:** [{website}]({website})" if website != 'N/A' else "**Website:** N/A")
-                                    st.markdown(f"**Number of Employees:** {lead.get('num_employees', 'N/A')}")
-                                
-                                with col2:
-                                    st.markdown("#### Company Profile")
-                                    st.markdown(f"**Match Score:** {lead.get('score', 'N/A')}/10")
-                                    st.progress(float(lead.get('score', 0)) / 10)
-                                
-                                st.markdown("#### Business Overview")
-                                st.markdown(lead['review'] if 'review' in lead else 'N/A')
-                                
-                                if 'recommendations' in lead:
-                                    st.markdown("#### Recommendations")
-                                    st.markdown(lead['recommendations'])
-                                
-                                # Display key decision makers in markdown format
-                                kdm = lead['key_decision_makers'] if 'key_decision_makers' in lead else []
-                                if kdm:
-                                    st.markdown("#### Key Decision Makers")
-                                    for person in kdm:
-                                        if isinstance(person, dict):
-                                            name = person['name'] if 'name' in person else 'N/A'
-                                            role = person['role'] if 'role' in person else 'N/A'
-                                            linkedin = person['linkedin'] if 'linkedin' in person else '#'
-                                            
-                                            linkedin_link = f"[LinkedIn Profile]({linkedin})" if linkedin != '#' else 'N/A'
-                                            st.markdown(f"**{name}** - {role} ({linkedin_link})")
-
-                        # Add a JSON view option at the bottom
-                        with st.expander("🔍 View Raw Data", expanded=False):
-                            st.json(results_list)
-
-                    except Exception as e:
-                        st.error(f"Error displaying results: {str(e)}")
-                        st.code(str(st.session_state.results), language='json')
+                    # Keep the last task's output, falling back to the crew's raw output
+                    if hasattr(results, 'tasks_output') and results.tasks_output and hasattr(results.tasks_output[-1], 'raw'):
+                        raw_output = results.tasks_output[-1].raw
+                    else:
+                        raw_output = results.raw if hasattr(results, 'raw') else "[]"
                     
-                    # Download section
-                    st.markdown("### 📥 Download Research Report")
-                    try:
-                        # Prepare markdown report
-                        download_data = "# Lead Generation Report\n\n"
-                        for lead in results_list:
-                            download_data += f"## {lead.get('company_name', 'N/A')}\n\n"
-                            download_data += f"- **Annual Revenue:** {lead.get('annual_revenue', 'N/A')}\n"
-                            download_data += f"- **Website:** {lead.get('website_url', 'N/A')}\n"
-                            download_data += f"- **Review:** {lead.get('review', 'N/A')}\n"
-                            download_data += f"- **Number of Employees:** {lead.get('num_employees', 'N/A')}\n"
-                            download_data += f"- **Score:** {lead.get('score', 'N/A')}/10\n\n"
-                            
-                            # Add key decision makers
-                            kdm = lead.get('key_decision_makers', [])
-                            if kdm:
-                                download_data += "### Key Decision Makers\n"
-                                for person in kdm:
-                                    if isinstance(person, dict):
-                                        download_data += f"- {person.get('name', 'N/A')} ({person.get('role', 'N/A')}): {person.get('linkedin', 'N/A')}\n"
-                                download_data += "\n"
-                            
-                            download_data += "---\n\n"
-                        
-                        # Also include raw JSON data at the end
-                        download_data += "\n## Raw JSON Data\n\n```json\n"
-                        download_data += json.dumps(results_list, indent=2)
-                        download_data += "\n```\n"
-                        
-                    except Exception as e:
-                        download_data = f"Error generating report: {str(e)}"
-                    
-                    st.download_button(
-                        label="Download Full Report",
-                        data=download_data,
-                        file_name=f"lead_generation_report_{industry}_{country}.md",
-                        mime="text/plain"
-                    )
-
-                    # Usage metrics section - immediately after results and download
-                    st.markdown("### 💰 Usage Metrics")
-                    
-                    try:
-                        # Check for usage metrics directly on the crew object (live, not from state)
-                        if hasattr(lead_gen_crew, 'usage_metrics'):
-                            metrics = lead_gen_crew.usage_metrics
-                            
-                            # First, let's display what we're dealing with for debugging
-                            #st.write(f"Metrics type: {type(metrics)}")
-                            metrics_str = str(metrics)
-                            #st.write(f"Metrics value: {metrics_str}")
-                            
-                            # Parse the metrics - whether it's a string directly or a UsageMetrics object with string representation
-                            metrics_dict = {}
-                            parse_string = metrics_str
-                            
-                            # Split by space and extract key-value pairs
-                            for item in parse_string.split():
-                                if "=" in item:
-                                    key, value = item.split("=")
-                                    try:
-                                        metrics_dict[key] = int(value)
-                                    except ValueError:
-                                        metrics_dict[key] = value
-                            
-                            # Display the parsed metrics
-                            with st.expander("🔍 Parsed Metrics", expanded=False):
-                                st.json(metrics_dict)
-                            
-                            # Extract relevant token counts
-                            input_tokens = metrics_dict.get('prompt_tokens', 0)
-                            output_tokens = metrics_dict.get('completion_tokens', 0)
-                            total_tokens = metrics_dict.get('total_tokens', 0)
-                            
-                            # Calculate approximate cost based on gpt-4 rates
-                            # $0.03/1K input tokens, $0.06/1K output tokens
-                            input_cost = (input_tokens / 1000000) * 0.015
-                            output_cost = (output_tokens / 1000000) * 0.06
-                            total_cost = input_cost + output_cost
-                            
-                            # Update the pricing tracker
-                            st.session_state.pricing_tracker.track_usage(
-                                input_tokens=input_tokens,
-                                output_tokens=output_tokens
-                            )
-                            
-                            # Display metrics in a user-friendly way
-                            #st.success("Usage metrics processed successfully")
-                            col1, col2, col3 = st.columns(3)
-                            with col1:
-                                st.metric("Total Cost", f"${total_cost:.4f}")
-                            with col2:
-                                st.metric("Input Tokens", f"{input_tokens:,}")
-                            with col3:
-                                st.metric("Output Tokens", f"{output_tokens:,}")
-                            
-                        # Try token_usage as fallback
-                        elif hasattr(results, 'token_usage') and results.token_usage:
-                            token_usage = results.token_usage
-                            
-                            # Display the token usage data
-                            with st.expander("🔍 Token Usage Data", expanded=False):
-                                st.write(token_usage)
-                            
-                            # Update the pricing tracker
-                            if isinstance(token_usage, dict):
-                                input_tokens = token_usage.get('total_prompt_tokens', 0)
-                                output_tokens = token_usage.get('total_completion_tokens', 0)
-                                
-                                st.session_state.pricing_tracker.track_usage(
-                                    input_tokens=input_tokens,
-                                    output_tokens=output_tokens
-                                )
-                                
-                                usage_summary = st.session_state.pricing_tracker.get_usage_summary()
-                                
-                                # Display metrics in a user-friendly way
-                                col1, col2, col3 = st.columns(3)
-                                with col1:
-                                    st.metric("Total Cost", f"${usage_summary['total_cost']:.4f}")
-                                with col2:
-                                    st.metric("Input Tokens", f"{usage_summary['input_tokens']:,}")
-                                with col3:
-                                    st.metric("Output Tokens", f"{usage_summary['output_tokens']:,}")
-                        else:
-                            st.info("No usage metrics available for this run")
-                            
-                    except Exception as cost_error:
-                        st.warning(f"Usage metrics calculation error: {str(cost_error)}")
-                        st.warning("This doesn't affect your results, just the usage tracking.")
-                        with st.expander("Error Details", expanded=False):
-                            import traceback
-                            st.code(traceback.format_exc())
+                    # Only cache results that contain leads
+                    if parse_leads(raw_output):
+                        get_llm_cache().set(industry, country, raw_output, embedding=embedding)
+                
+                # Store results in session state immediately
+                st.session_state.results = raw_output
+                run = build_run_results(raw_output, lead_gen_crew, results)
+                status.update(label="✅ Lead generation completed!", state="complete", expanded=False)
 
             except Exception as e:
                 status.update(label="❌ Error occurred", state="error")
                 st.error(f"An error occurred: {str(e)}")
                 st.stop()
+
+        # Phase 2: record the usage, before and independently of rendering
+        try:
+            if run.metrics:
+                get_pricing_tracker().track_usage(
+                    input_tokens=run.metrics['input_tokens'],
+                    output_tokens=run.metrics['output_tokens']
+                )
+            usage_summary = get_pricing_tracker().get_usage_summary()
+        except Exception as cost_error:
+            usage_summary = None
+            st.warning(f"Usage metrics calculation error: {str(cost_error)}")
+            st.warning("This doesn't affect your results, just the usage tracking.")
+            with st.expander("Error Details", expanded=False):
+                import traceback
+                st.code(traceback.format_exc())
+
+        # Phase 3: render
+        with results_container:
+            try:
+                render_results(
+                    run,
+                    usage_summary,
+                    get_llm_cache().stats,
+                    file_name=f"lead_generation_report_{industry}_{country}.md"
+                )
+            except Exception as e:
+                st.error(f"Error displaying results: {str(e)}")
+                st.code(str(st.session_state.results), language='json')
                 
 # Remove the duplicate results handling code
 if __name__ == "__main__":